@@ -1,7 +1,6 @@
 import os
 import sys
 import argparse
-import yaml
 import json
 from dotenv import load_dotenv
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -11,7 +10,7 @@ load_dotenv()
 from pathlib import Path
 from openai import OpenAI
 from src.py_libs.ingestion.story_setup import StorySetup
-from src.py_libs.flow.config_loader import ConfigLoader
+from src.py_libs.flow.config_loader import ConfigLoader, load_prompt_file
 from src.py_libs.flow.prompt_builder import PromptBuilder
 from src.py_libs.flow.retriever import ContextRetriever
 from src.py_libs.flow.generator import StoryGenerator
@@ -87,8 +86,7 @@ def main():
         # Read the story text
         story_file = get_story_file(story_path)
         print(f"✅ Found story file at: {story_file}")
-        with open(story_file, "r", encoding='utf-8') as f:
-            story_text = f.read()
+        story_text = story_file.read_text(encoding='utf-8')
         print(f"✅ Read story file ({len(story_text)} characters)")
 
         # Determine language if auto
@@ -101,8 +99,8 @@ def main():
         print(f"Using specified model: {args.model}")
 
         # Load shared configuration
-        with open(shared_config_path / "prompt.yaml", 'r', encoding='utf-8') as f:
-            prompts = yaml.safe_load(f)
+        # Shares the parsed-prompt cache with the analyzer and prompt builder
+        prompts = load_prompt_file(shared_config_path / "prompt.yaml")
         print("✅ Loaded shared configuration")
 
         # Process the story
@@ -199,7 +197,10 @@ def main():
         print("\nInitializing flow components...")
         config_loader = ConfigLoader(story_path, openai_client=openai_client, model=args.model)
         prompt_builder = PromptBuilder(story_path, language=args.language)
-        retriever = ContextRetriever(story_path)
+        # Reuse the ingestion model for queries instead of loading a second copy,
+        # unless it was quantized to int8: queries keep a float32 model then
+        query_model = None if story_setup.embedder.int8_cpu else story_setup.embedder.model
+        retriever = ContextRetriever(story_path, embedder=query_model)
         generator = StoryGenerator(story_path, openai_client, language=args.language, model=args.model)
         stitcher = ChapterStitcher(story_path)
         print("✅ Flow components initialized")
@@ -217,9 +218,7 @@ def main():
         story_context = story_text[-context_window:]  # Use last N chars as context
         
         # Get character context for each character in the story
-        character_contexts = {}
-        for character_name in story_elements['characters'].keys():
-            character_contexts[character_name] = retriever.get_character_context(character_name)
+        character_contexts = retriever.get_character_contexts(list(story_elements['characters'].keys()))
         
         # Build prompt for continuous narrative with character context
         prompt = prompt_builder.build_beat_prompt(
@@ -1,12 +1,12 @@
 from typing import List, Dict, Any
 from pathlib import Path
 import json
-import yaml
 from datetime import datetime
 from openai import OpenAI
 from src.py_libs.models.character_profile import CharacterProfile, FamilyRelation
 from pydantic import ValidationError
 from .model_config import ModelConfig
+from .config_loader import load_prompt_file
 
 class CharacterManager:
     def __init__(self, story_path: Path, openai_client: OpenAI | None = None, model: str = "gpt-3.5-turbo"):
@@ -26,8 +26,7 @@ class CharacterManager:
         
         # Load prompts from shared config
         shared_config_path = Path("config/shared")
-        with open(shared_config_path / "prompt.yaml", 'r', encoding='utf-8') as f:
-            self.prompts = yaml.safe_load(f)
+        self.prompts = load_prompt_file(shared_config_path / "prompt.yaml")
         
     def _serialize_datetime(self, dt: datetime) -> str:
         """Convert datetime to ISO format string."""
@@ -258,6 +257,9 @@ class CharacterManager:
         if self.profiles_path.exists():
             with open(self.profiles_path, 'r', encoding='utf-8') as f:
                 existing_profiles = json.load(f)
+                
+        # One timestamp for the whole save, formatted once
+        now = datetime.now().isoformat()
         
         # If new profiles are in nested format, convert to root format
         if isinstance(profiles, dict) and "characters" in profiles:
@@ -276,8 +278,8 @@ class CharacterManager:
                     "enemies": char.get("enemies", []),
                     "family": char.get("family", []),
                     "key_events": char.get("key_events", []),
-                    "created_at": datetime.now().isoformat(),
-                    "updated_at": datetime.now().isoformat()
+                    "created_at": now,
+                    "updated_at": now
                 }
                 for char in profiles["characters"]
             }
@@ -288,7 +290,7 @@ class CharacterManager:
             if name in existing_profiles:
                 # Convert to CharacterProfile objects for proper merging
                 existing_profile = CharacterProfile.from_dict(existing_profiles[name])
-                new_profile = CharacterProfile.from_dict(profile_data)
+                new_profile = CharacterProfile.from_untrusted_dict(profile_data)
                 
                 # Merge profiles using the original logic
                 merged_data = {
@@ -309,23 +311,22 @@ class CharacterManager:
                     "key_events": list(set(existing_profile.key_events + new_profile.key_events)),
                     "profile_text": new_profile.profile_text if new_profile.profile_text else existing_profile.profile_text,
                     "created_at": existing_profile.created_at.isoformat(),
-                    "updated_at": datetime.now().isoformat(),
+                    "updated_at": now,
                     "style_embedding": None
                 }
                 merged_profiles[name] = merged_data
             else:
-                # For new profiles, ensure all fields are present and serializable
-                if isinstance(profile_data, CharacterProfile):
-                    profile_data = profile_data.model_dump()
-                # Convert any FamilyRelation objects in family field
-                if "family" in profile_data and profile_data["family"]:
-                    profile_data["family"] = [
-                        {"name": rel["name"], "relation_type": rel["relation_type"]}
-                        if isinstance(rel, dict) else
-                        {"name": rel.name, "relation_type": rel.relation_type}
-                        for rel in profile_data["family"]
-                    ]
-                merged_profiles[name] = profile_data
+                # New profiles come straight from the LLM, so validate them
+                # before saving; later merges load saved profiles unvalidated
+                try:
+                    if not isinstance(profile_data, CharacterProfile):
+                        if isinstance(profile_data.get("family"), (list, dict)):
+                            profile_data["family"] = self._convert_family_list(profile_data["family"])
+                        profile_data = CharacterProfile.from_untrusted_dict(profile_data)
+                except (AttributeError, KeyError, TypeError, ValueError) as e:
+                    print(f"Warning: Skipping invalid profile for {name}: {str(e)}")
+                    continue
+                merged_profiles[name] = profile_data.to_dict()
         
         # First serialize to string to validate JSON
         try:
@@ -1,10 +1,43 @@
 from pathlib import Path
 import json
 import yaml
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List
+from functools import lru_cache
 from openai import OpenAI
+from pydantic import TypeAdapter
 from .model_config import ModelConfig
 
+try:
+    # libyaml-backed loader and dumper, when PyYAML was built with it
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+# Compiled once; validates a whole beats list in a single call
+_BEATS_ADAPTER = TypeAdapter(List[str])
+_STR_TAG = "tag:yaml.org,2002:str"
+
+def load_prompt_file(prompt_path: Path) -> Dict[str, Any]:
+    """
+    Load a YAML prompt file.
+    
+    Parsed prompts are cached per modification time, so the file is parsed
+    once per process and edits are still picked up.
+    
+    Args:
+        prompt_path: Path to the YAML prompt file
+        
+    Returns:
+        Dictionary of prompt templates; a fresh copy callers may add keys to
+    """
+    return dict(_load_prompt_file_cached(prompt_path, prompt_path.stat().st_mtime_ns))
+
+@lru_cache(maxsize=32)
+def _load_prompt_file_cached(prompt_path: Path, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a prompt file once per modification time; callers must not mutate the result."""
+    with open(prompt_path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
 class ConfigLoader:
     def __init__(self, story_path: Path, openai_client: OpenAI | None = None, model: str = "gpt-3.5-turbo"):
         """
@@ -61,32 +94,150 @@ class ConfigLoader:
         if not self.prompt_path.exists():
             raise FileNotFoundError(f"Shared prompt file not found at {self.prompt_path}")
             
-        with open(self.prompt_path, 'r', encoding='utf-8') as f:
-            prompts = yaml.safe_load(f)
-            # Ensure all required prompts are present
-            required_prompts = ["beat_expansion", "style_guidance", "character_extraction", "story_analysis"]
-            for prompt in required_prompts:
-                if prompt not in prompts:
-                    prompts[prompt] = f"Default prompt for {prompt}: {{text}}"
-            return prompts
+        prompts = load_prompt_file(self.prompt_path)
+        # Ensure all required prompts are present
+        required_prompts = ["beat_expansion", "style_guidance", "character_extraction", "story_analysis"]
+        for prompt in required_prompts:
+            if prompt not in prompts:
+                prompts[prompt] = f"Default prompt for {prompt}: {{text}}"
+        return prompts
             
-    def load_beats(self) -> List[Dict[str, str]]:
+    def load_beats(self) -> List[str]:
         """
         Load the story beats.
         
         Returns:
-            List of story beats
+            List of story beat descriptions
             
         Raises:
             FileNotFoundError: If the beats file doesn't exist
+            pydantic.ValidationError: If the beats are not a list of strings
         """
         if not self.beats_path.exists():
             raise FileNotFoundError(f"Beats file not found at {self.beats_path}")
             
         with open(self.beats_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-            return data["beats"]
+            data = yaml.load(f, Loader=SafeLoader)
+            return _BEATS_ADAPTER.validate_python(data["beats"])
 
+    def load_beats_iter(self) -> Iterator[str]:
+        """
+        Yield the story beats one at a time, reading beats.yaml as YAML events.
+        
+        Only the beat strings are constructed; the rest of the document is
+        scanned without building Python objects for it. The whole document is
+        read before the first beat is yielded, because a later beats key
+        overrides an earlier one. Results and errors match load_beats.
+        
+        Returns:
+            Iterator over story beat descriptions, in order
+            
+        Raises:
+            FileNotFoundError: If the beats file doesn't exist, raised at the call
+            TypeError: If the file is not a YAML mapping
+            KeyError: If the mapping has no beats key
+            ValueError: If the beats are not a list of strings
+            yaml.YAMLError: If the file is not a single valid YAML document
+        """
+        if not self.beats_path.exists():
+            raise FileNotFoundError(f"Beats file not found at {self.beats_path}")
+        return self._iter_beats()
+        
+    def _iter_beats(self) -> Iterator[str]:
+        """Read beats.yaml and yield its beats."""
+        with open(self.beats_path, 'r', encoding='utf-8') as f:
+            loader = SafeLoader(f)
+            try:
+                beats = self._scan_beats(loader)
+            finally:
+                loader.dispose()
+        yield from beats
+        
+    def _scan_beats(self, loader) -> List[str]:
+        """Walk the YAML event stream and return the last top-level beats list."""
+        # The document itself must be a mapping, as load_beats indexes it by key
+        loader.get_event()  # StreamStartEvent
+        if not loader.check_event(yaml.DocumentStartEvent):
+            raise TypeError("Beats file must contain a mapping")
+        loader.get_event()
+        if not loader.check_event(yaml.MappingStartEvent):
+            raise TypeError("Beats file must contain a mapping")
+        self._check_tag(loader, loader.get_event())
+        
+        anchors = {}
+        found = False
+        beats = None
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = self._scan_node(loader, anchors)
+            value = self._scan_node(loader, anchors)
+            if key == "beats":
+                # Duplicate keys: the last one wins, as with safe_load
+                found = True
+                beats = value
+        loader.get_event()  # MappingEndEvent
+        loader.get_event()  # DocumentEndEvent
+        if loader.check_event(yaml.DocumentStartEvent):
+            raise yaml.composer.ComposerError(
+                "expected a single document in the stream", None,
+                "but found another document", loader.get_event().start_mark
+            )
+            
+        if not found:
+            raise KeyError("beats")
+        if not isinstance(beats, list) or not all(isinstance(beat, str) for beat in beats):
+            raise ValueError("Beats must be a list of strings")
+        return beats
+        
+    def _scan_node(self, loader, anchors: Dict[str, Any]) -> Any:
+        """
+        Consume the events of one YAML node.
+        
+        Returns:
+            The string for a string scalar, a list of scanned items for a
+            sequence, and None for anything else; aliases resolve to what
+            their anchor scanned to
+        """
+        event = loader.get_event()
+        if isinstance(event, yaml.AliasEvent):
+            if event.anchor not in anchors:
+                raise yaml.composer.ComposerError(
+                    None, None, f"found undefined alias {event.anchor!r}", event.start_mark
+                )
+            return anchors[event.anchor]
+            
+        tag = self._check_tag(loader, event)
+        if isinstance(event, yaml.ScalarEvent):
+            # Resolve tags like the composer does, so 12 or null are not strings
+            if tag is None:
+                tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+            value = event.value if tag == _STR_TAG else None
+        elif isinstance(event, yaml.SequenceStartEvent):
+            value = []
+            while not loader.check_event(yaml.SequenceEndEvent):
+                value.append(self._scan_node(loader, anchors))
+            loader.get_event()
+        else:
+            while not loader.check_event(yaml.MappingEndEvent):
+                self._scan_node(loader, anchors)
+            loader.get_event()
+            value = None
+            
+        if event.anchor is not None:
+            anchors[event.anchor] = value
+        return value
+        
+    @staticmethod
+    def _check_tag(loader, event) -> str | None:
+        """Return a node event's explicit tag, rejecting tags safe_load cannot construct."""
+        tag = event.tag
+        if tag is None or tag == "!":
+            return None
+        if tag not in loader.yaml_constructors:
+            raise yaml.constructor.ConstructorError(
+                None, None, f"could not determine a constructor for the tag {tag!r}", event.start_mark
+            )
+        return tag
+            
     def analyze_beat(self, beat_description: str, story_context: str = None) -> Dict[str, Any]:
         """
         Analyze a beat description using LLM to determine character, context, and style.
@@ -243,7 +394,7 @@ class ConfigLoader:
         }
         
         with open(self.prompt_path, 'w', encoding='utf-8') as f:
-            yaml.dump(prompts, f, allow_unicode=True)
+            yaml.dump(prompts, f, Dumper=SafeDumper, allow_unicode=True)
             
         return prompts
 
@@ -253,6 +404,6 @@ class ConfigLoader:
         
         beats_config = {"beats": beats}
         with open(self.beats_path, 'w', encoding='utf-8') as f:
-            yaml.dump(beats_config, f, allow_unicode=True)
+            yaml.dump(beats_config, f, Dumper=SafeDumper, allow_unicode=True)
             
         return beats 
\ No newline at end of file
@@ -1,7 +1,14 @@
 from typing import Dict, Any
 from pathlib import Path
+from functools import lru_cache
 import json
 
+@lru_cache(maxsize=32)
+def _load_json_cached(config_path: Path, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a JSON config once per modification time; callers must not mutate the result."""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
 class ModelConfig:
     def __init__(self):
         """Initialize the model configuration manager."""
@@ -13,8 +20,8 @@ class ModelConfig:
         if not self.config_path.exists():
             raise FileNotFoundError(f"Model config file not found at {self.config_path}")
             
-        with open(self.config_path, 'r', encoding='utf-8') as f:
-            self.config = json.load(f)
+        # Every loader constructs its own ModelConfig; the file is parsed once
+        self.config = _load_json_cached(self.config_path, self.config_path.stat().st_mtime_ns)
             
     def get_model_config(self) -> Dict[str, Any]:
         """
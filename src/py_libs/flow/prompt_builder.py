@@ -1,6 +1,31 @@
 from typing import List, Dict, Any
 from pathlib import Path
-import yaml
+from functools import lru_cache
+from src.py_libs.models.prompt import PromptTemplate
+from .config_loader import load_prompt_file
+
+_RELATIONSHIP_TEMPLATE = """
+        Develop the relationship between {character1} and {character2} based on the following context:
+        
+        {context_text}
+        
+        Consider:
+        - Nature of their relationship
+        - Key moments in their history
+        - Current dynamics and tensions
+        - Future potential developments
+        """
+
+@lru_cache(maxsize=64)
+def _compile(template: str) -> PromptTemplate:
+    """Parse a prompt template once; keyed by text, so edited prompts recompile."""
+    return PromptTemplate(template=template, variables={}, metadata={})
+
+def _render(template: str, **kwargs) -> str:
+    """Format a prompt template through its cached parse."""
+    if not template:
+        return template
+    return _compile(template).format(**kwargs)
 
 class PromptBuilder:
     def __init__(self, story_path: Path, language: str = "en"):
@@ -19,11 +44,10 @@ class PromptBuilder:
         
     def _load_prompts(self):
         """Load prompt templates from the shared configuration."""
-        with open(self.prompt_path, 'r', encoding='utf-8') as f:
-            self.prompts = yaml.safe_load(f)
-            # Ensure all required prompts are present
-            required_prompts = {
-                "beat_expansion": """
+        self.prompts = load_prompt_file(self.prompt_path)
+        # Ensure all required prompts are present
+        required_prompts = {
+            "beat_expansion": """
                 Write a continuous narrative in {language} that seamlessly continues the story, incorporating the following story beats:
                 {beats}
                 
@@ -43,14 +67,14 @@ class PromptBuilder:
                 3. Develops the characters and their relationships based on their established profiles
                 4. Advances the plot naturally
                 """,
-                "style_guidance": "Analyze style: {text}",
-                "character_extraction": "Extract character details: {text}",
-                "story_analysis": "Analyze story: {text}"
-            }
-            for prompt_name, default_prompt in required_prompts.items():
-                if prompt_name not in self.prompts:
-                    self.prompts[prompt_name] = default_prompt
-            
+            "style_guidance": "Analyze style: {text}",
+            "character_extraction": "Extract character details: {text}",
+            "story_analysis": "Analyze story: {text}"
+        }
+        for prompt_name, default_prompt in required_prompts.items():
+            if prompt_name not in self.prompts:
+                self.prompts[prompt_name] = default_prompt
+        
     def build_beat_prompt(self, beats: str, context: str, style: dict, character_contexts: dict = None) -> str:
         """Build a prompt for generating continuous narrative from story beats."""
         # Add character context section if available
@@ -63,7 +87,8 @@ class PromptBuilder:
                     character_context_section += f"Context {i+1}:\n{context_chunk['text']}\n"
         
         # Format the base prompt
-        base_prompt = self.prompts['beat_expansion'].format(
+        base_prompt = _render(
+            self.prompts['beat_expansion'],
             beats=beats,
             context=context,
             tone=style.get('tone', 'neutral'),
@@ -92,6 +117,13 @@ class PromptBuilder:
         
         return base_prompt
         
+    def _format_contexts(self, context: List[Dict[str, Any]]) -> str:
+        """Join context chunks into numbered sections."""
+        return "\n\n".join([
+            f"Context {i+1}:\n{chunk['text']}"
+            for i, chunk in enumerate(context)
+        ])
+        
     def build_style_prompt(self, text: str) -> str:
         """
         Build a prompt for style analysis.
@@ -102,7 +134,7 @@ class PromptBuilder:
         Returns:
             Formatted prompt string
         """
-        return self.prompts["style_guidance"].format(text=text)
+        return _render(self.prompts["style_guidance"], text=text)
         
     def build_character_prompt(self, character: str, context: List[Dict[str, Any]]) -> str:
         """
@@ -115,13 +147,9 @@ class PromptBuilder:
         Returns:
             Formatted prompt string
         """
-        context_text = "\n\n".join([
-            f"Context {i+1}:\n{chunk['text']}"
-            for i, chunk in enumerate(context)
-        ])
-        
-        return self.prompts["character_extraction"].format(
-            text=context_text
+        return _render(
+            self.prompts["character_extraction"],
+            text=self._format_contexts(context)
         )
         
     def build_relationship_prompt(self, character1: str, character2: str, context: List[Dict[str, Any]]) -> str:
@@ -136,19 +164,9 @@ class PromptBuilder:
         Returns:
             Formatted prompt string
         """
-        context_text = "\n\n".join([
-            f"Context {i+1}:\n{chunk['text']}"
-            for i, chunk in enumerate(context)
-        ])
-        
-        return f"""
-        Develop the relationship between {character1} and {character2} based on the following context:
-        
-        {context_text}
-        
-        Consider:
-        - Nature of their relationship
-        - Key moments in their history
-        - Current dynamics and tensions
-        - Future potential developments
-        """ 
\ No newline at end of file
+        return _render(
+            _RELATIONSHIP_TEMPLATE,
+            character1=character1,
+            character2=character2,
+            context_text=self._format_contexts(context)
+        )
\ No newline at end of file
@@ -3,20 +3,31 @@ import numpy as np
 from pathlib import Path
 import json
 from sentence_transformers import SentenceTransformer
-from src.py_libs.ingestion.version_manager import VersionManager
-from src.py_libs.models.character_profile import CharacterProfile, FamilyRelation
+from src.py_libs.ingestion.version_manager import VersionManager, replace_version_file
+from src.py_libs.models.character_profile import CharacterProfile
 from datetime import datetime
 
 class ContextRetriever:
-    def __init__(self, story_path: Path):
+    # Maps a relationship type to the profile field holding those character names
+    _RELATIONSHIP_ACCESSORS = {
+        'friends': lambda profile: profile.friends,
+        'enemies': lambda profile: profile.enemies,
+        'lovers': lambda profile: profile.lovers,
+        'family': lambda profile: [relation.name for relation in profile.family]
+    }
+    
+    def __init__(self, story_path: Path, embedder: SentenceTransformer | None = None):
         """
         Initialize the context retriever for a story.
         
         Args:
             story_path: Path to the story directory
+            embedder: SentenceTransformer to embed queries with, if None a new
+                all-MiniLM-L6-v2 model will be loaded. Must match the model the
+                index was built with.
         """
         self.story_path = story_path
-        self.embedder = SentenceTransformer("all-MiniLM-L6-v2")
+        self.embedder = embedder if embedder is not None else SentenceTransformer("all-MiniLM-L6-v2")
         self.version_manager = VersionManager(story_path)
         self._load_index()
         self._load_character_profiles()
@@ -32,11 +43,61 @@ class ContextRetriever:
         
         # Load index
         import faiss
-        self.index = faiss.read_index(str(version_path / "faiss_index" / "index.faiss"))
+        # Memory-map the index read-only; IVF inverted lists stay on disk and
+        # are paged in on access. Index types without mmap support load normally.
+        self.index = faiss.read_index(
+            str(version_path / "faiss_index" / "index.faiss"),
+            faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+        )
+        # Inner-product indexes hold normalized embeddings, so queries must match;
+        # older L2 indexes were built from unnormalized ones
+        self._inner_product = self.index.metric_type == faiss.METRIC_INNER_PRODUCT
         
         # Load metadata
-        with open(version_path / "faiss_index" / "metadata.json", 'r') as f:
-            self.metadata = json.load(f)
+        self._load_metadata(version_path)
+        
+    def _load_metadata(self, version_path: Path):
+        """
+        Load chunk metadata as parallel column arrays.
+        
+        The columns are cached in a metadata.npz sidecar, built from the
+        version's passages.json the first time a version is loaded. Older
+        versions without passages.json fall back to faiss_index/metadata.json.
+        If the sidecar cannot be written, the columns come from the JSON alone.
+        
+        Args:
+            version_path: Directory of the version to load
+        """
+        json_path = version_path / "passages.json"
+        if not json_path.exists():
+            json_path = version_path / "faiss_index" / "metadata.json"
+        columns_path = version_path / "faiss_index" / "metadata.npz"
+        
+        if columns_path.exists() and columns_path.stat().st_mtime >= json_path.stat().st_mtime:
+            with np.load(columns_path) as columns:
+                self._texts = columns['text'].tolist()
+                self._start_pos = columns['start_pos'].tolist()
+                self._end_pos = columns['end_pos'].tolist()
+            return
+            
+        # One bulk read of the raw bytes; json decodes UTF-8 itself
+        metadata = json.loads(json_path.read_bytes())
+        self._texts = [chunk['text'] for chunk in metadata]
+        self._start_pos = [chunk['start_pos'] for chunk in metadata]
+        self._end_pos = [chunk['end_pos'] for chunk in metadata]
+        
+        # Concurrent retrievers never load a partially written sidecar
+        try:
+            with replace_version_file(columns_path) as tmp_path, open(tmp_path, 'wb') as f:
+                np.savez(
+                    f,
+                    text=np.array(self._texts, dtype=str),
+                    start_pos=np.array(self._start_pos, dtype=np.int64),
+                    end_pos=np.array(self._end_pos, dtype=np.int64)
+                )
+        except OSError:
+            # Read-only story directories still load, just without the cache
+            pass
             
     def _load_character_profiles(self):
         """Load character profiles from the story directory."""
@@ -49,19 +110,48 @@ class ContextRetriever:
                 self.character_profiles = {}
                 for name, data in profiles_data.items():
                     try:
-                        # Convert family data to FamilyRelation objects if needed
-                        if "family" in data and isinstance(data["family"], list):
-                            data["family"] = [
-                                FamilyRelation(**rel) if isinstance(rel, dict) else rel
-                                for rel in data["family"]
-                            ]
-                        self.character_profiles[name] = CharacterProfile.from_dict(data)
+                        # Validate: older or hand-edited files may hold malformed profiles;
+                        # validation also builds the FamilyRelation objects
+                        self.character_profiles[name] = CharacterProfile.from_untrusted_dict(data)
                     except Exception as e:
                         print(f"Warning: Failed to load profile for {name}: {str(e)}")
                         continue
         else:
             self.character_profiles = {}
             
+        self._precompute_character_queries()
+            
+    def _encode(self, queries: List[str]) -> np.ndarray:
+        """Embed a list of query strings in a single batched model call."""
+        return self.embedder.encode(
+            queries,
+            batch_size=64,
+            convert_to_numpy=True,
+            normalize_embeddings=self._inner_product
+        )
+        
+    def _build_character_query(self, character_name: str, profile: Optional[CharacterProfile]) -> str:
+        """Build the retrieval query used for a character's context."""
+        if not profile:
+            return f"Character: {character_name}"
+            
+        # Build rich query using profile information
+        query_parts = [
+            f"Character: {character_name}",
+            f"Role: {profile.role}",
+            f"Traits: {', '.join(profile.personality_traits)}",
+            f"Goals: {', '.join(profile.goals)}"
+        ]
+        return " ".join(query_parts)
+        
+    def _precompute_character_queries(self):
+        """Embed the fixed per-character queries once so lookups skip the model."""
+        queries = [
+            self._build_character_query(name, profile)
+            for name, profile in self.character_profiles.items()
+        ]
+        self._query_embeddings = dict(zip(queries, self._encode(queries))) if queries else {}
+            
     def _save_character_profiles(self):
         """Save character profiles to disk."""
         profiles_path = self.story_path / "character_profiles.json"
@@ -72,6 +162,9 @@ class ContextRetriever:
         with open(profiles_path, 'w', encoding='utf-8') as f:
             json.dump(profiles_data, f, indent=2, ensure_ascii=False)
             
+        # Profiles changed, so the cached character queries are stale
+        self._precompute_character_queries()
+            
     def retrieve_context(self, query: str, num_chunks: int = 5) -> List[Dict[str, Any]]:
         """
         Retrieve relevant context for a query.
@@ -83,24 +176,52 @@ class ContextRetriever:
         Returns:
             List of relevant chunks with metadata
         """
-        # Embed query
-        query_embedding = self.embedder.encode(query, convert_to_numpy=True)
+        return self.retrieve_many([query], num_chunks)[0]
+        
+    def retrieve_many(self, queries: List[str], num_chunks: int = 5) -> List[List[Dict[str, Any]]]:
+        """
+        Retrieve relevant context for several queries at once.
+        
+        Queries without a precomputed embedding are embedded in one model
+        call, and all queries are searched with one FAISS call.
+        
+        Args:
+            queries: The query strings
+            num_chunks: Number of chunks to retrieve per query
+            
+        Returns:
+            One list of relevant chunks with metadata per query, in order
+        """
+        if not queries:
+            return []
+            
+        # Embed queries, reusing precomputed embeddings when available
+        missing = list(dict.fromkeys(q for q in queries if q not in self._query_embeddings))
+        encoded = dict(zip(missing, self._encode(missing))) if missing else {}
+        query_embeddings = np.stack([
+            self._query_embeddings[q] if q in self._query_embeddings else encoded[q]
+            for q in queries
+        ]).astype('float32')
         
         # Search index
-        distances, indices = self.index.search(
-            query_embedding.reshape(1, -1).astype('float32'),
-            num_chunks
-        )
+        distances, indices = self.index.search(query_embeddings, num_chunks)
         
         # Get chunks
-        chunks = []
-        for idx, distance in zip(indices[0], distances[0]):
-            if idx < len(self.metadata):  # Ensure index is valid
-                chunk = self.metadata[idx].copy()
-                chunk['similarity_score'] = float(1 - distance)  # Convert to similarity score
-                chunks.append(chunk)
-                
-        return chunks
+        results = []
+        for row_indices, row_distances in zip(indices.tolist(), distances.tolist()):
+            chunks = []
+            for idx, distance in zip(row_indices, row_distances):
+                if 0 <= idx < len(self._texts):  # Ensure index is valid
+                    chunks.append({
+                        'text': self._texts[idx],
+                        'start_pos': self._start_pos[idx],
+                        'end_pos': self._end_pos[idx],
+                        # Inner product is already a cosine similarity; convert L2 distances
+                        'similarity_score': distance if self._inner_product else 1 - distance
+                    })
+            results.append(chunks)
+            
+        return results
         
     def get_character_profile(self, character_name: str) -> Optional[CharacterProfile]:
         """
@@ -134,23 +255,27 @@ class ContextRetriever:
         Returns:
             List of relevant chunks with metadata
         """
-        # Get character profile
+        # Falls back to basic retrieval if no profile exists
         profile = self.get_character_profile(character_name)
-        if not profile:
-            # Fallback to basic retrieval if no profile exists
-            query = f"Character: {character_name}"
-            return self.retrieve_context(query, num_chunks)
+        query = self._build_character_query(character_name, profile)
+        return self.retrieve_context(query, num_chunks)
+        
+    def get_character_contexts(self, character_names: List[str], num_chunks: int = 5) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Retrieve context for several characters with one batched search.
+        
+        Args:
+            character_names: Names of the characters
+            num_chunks: Number of chunks to retrieve per character
             
-        # Build rich query using profile information
-        query_parts = [
-            f"Character: {character_name}",
-            f"Role: {profile.role}",
-            f"Traits: {', '.join(profile.personality_traits)}",
-            f"Goals: {', '.join(profile.goals)}"
+        Returns:
+            Dictionary mapping each character name to its relevant chunks
+        """
+        queries = [
+            self._build_character_query(name, self.get_character_profile(name))
+            for name in character_names
         ]
-        query = " ".join(query_parts)
-        
-        return self.retrieve_context(query, num_chunks)
+        return dict(zip(character_names, self.retrieve_many(queries, num_chunks)))
         
     def get_relationship_context(self, character1: str, character2: str, num_chunks: int = 5) -> List[Dict[str, Any]]:
         """
@@ -179,7 +304,7 @@ class ContextRetriever:
                 query_parts.append("friendship")
             if character2 in profile1.enemies:
                 query_parts.append("conflict")
-            if character2 in [f["name"] for f in profile1.family]:
+            if character2 in self._RELATIONSHIP_ACCESSORS['family'](profile1):
                 query_parts.append("family relationship")
                 
         query = " ".join(query_parts)
@@ -227,16 +352,8 @@ class ContextRetriever:
             List of character names
         """
         profile = self.get_character_profile(character_name)
-        if not profile:
+        accessor = self._RELATIONSHIP_ACCESSORS.get(relationship_type)
+        if not profile or not accessor:
             return []
             
-        if relationship_type == 'friends':
-            return profile.friends
-        elif relationship_type == 'enemies':
-            return profile.enemies
-        elif relationship_type == 'lovers':
-            return profile.lovers
-        elif relationship_type == 'family':
-            return [f["name"] for f in profile.family]
-        else:
-            return [] 
\ No newline at end of file
+        return accessor(profile)
\ No newline at end of file
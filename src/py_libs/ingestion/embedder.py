@@ -1,38 +1,82 @@
-from typing import List, Dict, Any, Iterator
+from typing import List, Dict, Any
 import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 from pathlib import Path
+from functools import cached_property
+import atexit
 import json
 import os
+from .version_manager import replace_version_file
 
 class TextEmbedder:
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2", batch_size: int = 8):
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", batch_size: int = 64, quantize: bool = True,
+                 pool_threshold: int = 1024, int8_cpu: bool = False):
         """
         Initialize the text embedder with a SentenceTransformer model.
         
         Args:
             model_name: Name of the SentenceTransformer model to use
             batch_size: Number of texts to process at once
+            quantize: Store saved embeddings as float16 instead of float32
+            pool_threshold: On CPU, inputs with more texts than this are encoded
+                by a pool of worker processes
+            int8_cpu: On CPU, quantize the model's linear layers to int8; faster
+                encoding at a small cost in embedding precision
         """
-        self.model = SentenceTransformer(model_name)
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self._model_name = model_name
         self.batch_size = batch_size
+        self.quantize = quantize
+        self.pool_threshold = pool_threshold
+        self.pool = None
+        self.int8_cpu = int8_cpu
         
-    def _batch_iterator(self, texts: List[str]) -> Iterator[List[str]]:
+    @cached_property
+    def model(self) -> SentenceTransformer:
+        """Load the SentenceTransformer model on first use."""
+        model = SentenceTransformer(self._model_name, device=self.device)
+        if self.device == "cuda":
+            # Half precision runs on tensor cores. Saved embeddings are float16
+            # when quantize is set (float32 otherwise), and IndexBuilder adds
+            # them to the index as float32
+            model.half()
+        elif self.int8_cpu:
+            # Int8 weights with dynamically quantized activations for every
+            # linear layer, which is where transformer encoding spends its time
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return model
+        
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
         """
-        Create batches of texts.
+        Generate L2-normalized embeddings for a list of texts in batches.
+        
+        The whole list goes to a single encode call so SentenceTransformer can
+        sort all texts by length before batching, which keeps padding minimal.
+        Normalized vectors make inner-product search equivalent to cosine.
         
         Args:
-            texts: List of text strings to batch
+            texts: List of text strings to embed
             
         Returns:
-            Iterator of text batches
+            numpy array of embeddings
         """
-        for i in range(0, len(texts), self.batch_size):
-            yield texts[i:i + self.batch_size]
+        if self.device == "cpu" and len(texts) > self.pool_threshold:
+            return self._encode_multi_process(texts)
+            
+        return self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
     
-    def embed_texts(self, texts: List[str]) -> np.ndarray:
+    def _encode_multi_process(self, texts: List[str]) -> np.ndarray:
         """
-        Generate embeddings for a list of texts in batches.
+        Encode texts across several CPU worker processes.
+        
+        The pool is started on first use and stopped at interpreter exit.
         
         Args:
             texts: List of text strings to embed
@@ -40,11 +84,16 @@ class TextEmbedder:
         Returns:
             numpy array of embeddings
         """
-        all_embeddings = []
-        for batch in self._batch_iterator(texts):
-            batch_embeddings = self.model.encode(batch, convert_to_numpy=True)
-            all_embeddings.append(batch_embeddings)
-        return np.vstack(all_embeddings)
+        if self.pool is None:
+            self.pool = self.model.start_multi_process_pool(["cpu"] * min(os.cpu_count() or 1, 4))
+            atexit.register(self.model.stop_multi_process_pool, self.pool)
+            
+        return self.model.encode_multi_process(
+            texts,
+            self.pool,
+            batch_size=self.batch_size,
+            normalize_embeddings=True
+        )
     
     def embed_chunks(self, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -59,32 +108,64 @@ class TextEmbedder:
         texts = [chunk['text'] for chunk in chunks]
         embeddings = self.embed_texts(texts)
         
+        # Each chunk holds a row view of the embedding matrix, not a copy
         for chunk, embedding in zip(chunks, embeddings):
-            chunk['embedding'] = embedding.tolist()
+            chunk['embedding'] = embedding
             
         return chunks
     
     def save_embeddings(self, chunks: List[Dict[str, Any]], output_path: Path):
         """
-        Save chunks with embeddings to a JSON file.
+        Save chunks with embeddings to disk.
+        
+        Chunk text and positions are written as JSON to output_path, while the
+        embeddings are stacked into a matrix saved next to it as .npy. The
+        matrix is float16 when quantize is set; normalized embeddings lose
+        almost no precision and take half the space.
         
         Args:
             chunks: List of chunk dictionaries with embeddings
-            output_path: Path to save the embeddings
+            output_path: Path to save the chunk JSON file
         """
         os.makedirs(output_path.parent, exist_ok=True)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(chunks, f, indent=2, ensure_ascii=False)
+        dtype = np.float16 if self.quantize else np.float32
+        embeddings = np.array([chunk['embedding'] for chunk in chunks], dtype=dtype)
+        
+        with replace_version_file(output_path.with_suffix('.npy')) as tmp_path, open(tmp_path, 'wb') as f:
+            np.save(f, embeddings)
+        with replace_version_file(output_path) as tmp_path, open(tmp_path, 'w', encoding='utf-8') as f:
+            # Stream one passage at a time instead of building the whole list;
+            # the output matches json.dump with compact separators
+            f.write('[')
+            for i, chunk in enumerate(chunks):
+                if i:
+                    f.write(',')
+                passage = {key: value for key, value in chunk.items() if key != 'embedding'}
+                f.write(json.dumps(passage, ensure_ascii=False, separators=(',', ':')))
+            f.write(']')
             
     def load_embeddings(self, input_path: Path) -> List[Dict[str, Any]]:
         """
-        Load chunks with embeddings from a JSON file.
+        Load chunks with embeddings saved by save_embeddings.
+        
+        The embedding matrix is memory-mapped, so each chunk's 'embedding' is a
+        read-only view into the file, in the dtype it was saved with.
+        IndexBuilder casts to float32 when adding them. Older versions that
+        stored embeddings inline in the JSON are returned as-is.
         
         Args:
-            input_path: Path to load embeddings from
+            input_path: Path to the chunk JSON file
             
         Returns:
             List of chunk dictionaries with embeddings
         """
         with open(input_path, 'r', encoding='utf-8') as f:
-            return json.load(f) 
\ No newline at end of file
+            chunks = json.load(f)
+            
+        embeddings_path = input_path.with_suffix('.npy')
+        if embeddings_path.exists():
+            embeddings = np.load(embeddings_path, mmap_mode='r')
+            for chunk, embedding in zip(chunks, embeddings):
+                chunk['embedding'] = embedding
+                
+        return chunks
\ No newline at end of file
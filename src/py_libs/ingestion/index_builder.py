@@ -1,20 +1,38 @@
 from typing import List, Dict, Any
 import numpy as np
 from pathlib import Path
-import json
 import os
 import faiss
+from .version_manager import replace_version_file
 
 class IndexBuilder:
-    def __init__(self, dimension: int = 384):  # Default dimension for all-MiniLM-L6-v2
+    def __init__(self, dimension: int = 384,  # Default dimension for all-MiniLM-L6-v2
+                 index_type: str = "HNSW32,SQ8", metric: int = faiss.METRIC_INNER_PRODUCT,
+                 large_index_threshold: int | None = 10_000):
         """
         Initialize the index builder.
         
         Args:
             dimension: Dimension of the embeddings
+            index_type: FAISS index factory string (e.g. "HNSW32,SQ8", "IVF256,PQ32", "Flat").
+                The default stores vectors as 8-bit scalar codes, a quarter of
+                the float32 size. Types that need training are trained on the
+                first build.
+            metric: FAISS metric; inner product equals cosine similarity on the
+                normalized embeddings produced by TextEmbedder
+            large_index_threshold: First builds with more chunks than this use an
+                IVF-PQ index instead, storing 16 bytes per vector; None always
+                uses index_type
         """
         self.dimension = dimension
-        self.index = faiss.IndexFlatL2(dimension)
+        self.index_type = index_type
+        self.metric = metric
+        self.large_index_threshold = large_index_threshold
+        self.index = faiss.index_factory(dimension, index_type, metric)
+        
+    def reset_index(self) -> None:
+        """Replace the index with a new, empty one of the configured type."""
+        self.index = faiss.index_factory(self.dimension, self.index_type, self.metric)
         
     def build_index(self, chunks: List[Dict[str, Any]]) -> None:
         """
@@ -23,21 +41,100 @@ class IndexBuilder:
         Args:
             chunks: List of chunk dictionaries with 'embedding' field
         """
-        embeddings = np.array([chunk['embedding'] for chunk in chunks]).astype('float32')
+        # Stacking row arrays is a C-level copy; no per-float Python objects
+        embeddings = np.array([chunk['embedding'] for chunk in chunks], dtype=np.float32)
+        if self._use_large_index(len(embeddings)):
+            self.index = self._create_large_index(len(embeddings))
+        if not self.index.is_trained:
+            self.index.train(embeddings)
+        self.index.add(embeddings)
+        
+    def _use_large_index(self, num_vectors: int) -> bool:
+        """Whether a first build of num_vectors should switch to an IVF-PQ index."""
+        return (
+            self.large_index_threshold is not None
+            and num_vectors > self.large_index_threshold
+            and self.index.ntotal == 0
+            and self.dimension % 16 == 0
+        )
+        
+    def _create_large_index(self, num_vectors: int) -> faiss.Index:
+        """
+        Create an IVF-PQ index sized for num_vectors.
+        
+        Uses 4 * sqrt(N) inverted lists and 16 8-bit PQ codes per vector. The
+        default nprobe is saved with the index, so searches after loading it
+        visit enough lists to keep recall reasonable.
+        """
+        nlist = int(4 * np.sqrt(num_vectors))
+        index = faiss.index_factory(self.dimension, f"IVF{nlist},PQ16", self.metric)
+        faiss.extract_index_ivf(index).nprobe = max(1, nlist // 16)
+        return index
+        
+    def update_index(self, new_chunks: List[Dict[str, Any]]) -> None:
+        """
+        Append embeddings of new chunks to the existing index.
+        
+        FAISS ids stay positional: the new chunks take the ids following the
+        current vectors, so they must be appended to the metadata in the same
+        order. An empty or untrained index is built from scratch instead.
+        
+        Args:
+            new_chunks: List of chunk dictionaries with 'embedding' field
+        """
+        if not new_chunks:
+            return
+        if self.index.ntotal == 0 or not self.index.is_trained:
+            self.build_index(new_chunks)
+            return
+            
+        embeddings = np.array([chunk['embedding'] for chunk in new_chunks], dtype=np.float32)
         self.index.add(embeddings)
         
-    def search(self, query_embedding: np.ndarray, k: int = 5) -> List[int]:
+    def search_batch(self, query_embeddings: np.ndarray, k: int = 5, nprobe: int | None = None,
+                     ef_search: int | None = None) -> np.ndarray:
+        """
+        Search the index for several query embeddings in one FAISS call.
+        
+        Args:
+            query_embeddings: Matrix of query embeddings, one row per query
+            k: Number of results to return per query
+            nprobe: Number of inverted lists to visit for this call only (IVF
+                indexes only; ignored otherwise)
+            ef_search: Size of the search candidate list for this call only (HNSW
+                indexes only; ignored otherwise)
+            
+        Returns:
+            int64 array of shape (num_queries, k) with the indices of similar chunks
+        """
+        # Per-call search parameters leave the index's own defaults untouched
+        params = None
+        if nprobe is not None and isinstance(self.index, faiss.IndexIVF):
+            params = faiss.SearchParametersIVF(nprobe=nprobe)
+        elif ef_search is not None and isinstance(self.index, faiss.IndexHNSW):
+            params = faiss.SearchParametersHNSW(efSearch=ef_search)
+            
+        queries = np.ascontiguousarray(query_embeddings, dtype=np.float32)
+        distances, indices = self.index.search(queries, k, params=params)
+        return indices
+        
+    def search(self, query_embedding: np.ndarray, k: int = 5, nprobe: int | None = None,
+               ef_search: int | None = None) -> List[int]:
         """
         Search the index for similar embeddings.
         
         Args:
             query_embedding: Query embedding vector
             k: Number of results to return
+            nprobe: Number of inverted lists to visit for this call only (IVF
+                indexes only; ignored otherwise)
+            ef_search: Size of the search candidate list for this call only (HNSW
+                indexes only; ignored otherwise)
             
         Returns:
             List of indices of similar chunks
         """
-        distances, indices = self.index.search(query_embedding.reshape(1, -1), k)
+        indices = self.search_batch(query_embedding.reshape(1, -1), k, nprobe=nprobe, ef_search=ef_search)
         return indices[0].tolist()
     
     def save_index(self, output_path: Path):
@@ -48,7 +145,8 @@ class IndexBuilder:
             output_path: Path to save the index
         """
         os.makedirs(output_path.parent, exist_ok=True)
-        faiss.write_index(self.index, str(output_path))
+        with replace_version_file(output_path) as tmp_path:
+            faiss.write_index(self.index, str(tmp_path))
         
     def load_index(self, input_path: Path):
         """
@@ -58,33 +156,3 @@ class IndexBuilder:
             input_path: Path to load the index from
         """
         self.index = faiss.read_index(str(input_path))
-        
-    def save_metadata(self, chunks: List[Dict[str, Any]], output_path: Path):
-        """
-        Save chunk metadata to a JSON file.
-        
-        Args:
-            chunks: List of chunk dictionaries
-            output_path: Path to save the metadata
-        """
-        metadata = [{
-            'text': chunk['text'],
-            'start_pos': chunk['start_pos'],
-            'end_pos': chunk['end_pos']
-        } for chunk in chunks]
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
-            
-    def load_metadata(self, input_path: Path) -> List[Dict[str, Any]]:
-        """
-        Load chunk metadata from a JSON file.
-        
-        Args:
-            input_path: Path to load metadata from
-            
-        Returns:
-            List of chunk dictionaries
-        """
-        with open(input_path, 'r', encoding='utf-8') as f:
-            return json.load(f) 
\ No newline at end of file
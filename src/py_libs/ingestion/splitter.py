@@ -1,8 +1,12 @@
 from typing import List, Dict, Iterator
 import json
+import re
 from pathlib import Path
 
 class TextSplitter:
+    _SENTENCE_ENDINGS = ('.', '!', '?')
+    _SENTENCE_END = re.compile(r'[.!?]')
+    
     def __init__(self, chunk_size: int = 500, chunk_overlap: int = 50):
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
@@ -19,20 +23,15 @@ class TextSplitter:
         Returns:
             Position of the nearest sentence boundary
         """
-        sentence_endings = ['.', '!', '?']
-        
         if direction == 'forward':
             # Search forward for the next sentence ending
-            for i in range(position, min(len(text), position + 100)):
-                if text[i] in sentence_endings:
-                    return i + 1
-            return position
+            match = self._SENTENCE_END.search(text, position, min(len(text), position + 100))
+            return match.end() if match else position
         else:
             # Search backward for the previous sentence ending
-            for i in range(position - 1, max(-1, position - 100), -1):
-                if i >= 0 and text[i] in sentence_endings:
-                    return i + 1
-            return position
+            start = max(0, position - 99)
+            boundary = max(text.rfind(ending, start, position) for ending in self._SENTENCE_ENDINGS)
+            return boundary + 1 if boundary >= 0 else position
 
     def split_text(self, text: str) -> List[Dict[str, str]]:
         """
@@ -46,14 +45,19 @@ class TextSplitter:
         """
         chunks = []
         start = 0
+        # Bind loop invariants once; the loop body runs once per chunk
+        text_length = len(text)
+        chunk_size = self.chunk_size
+        chunk_overlap = self.chunk_overlap
+        find_boundary = self._find_sentence_boundary
         
-        while start < len(text):
+        while start < text_length:
             # Calculate the initial end position
-            end = min(start + self.chunk_size, len(text))
+            end = min(start + chunk_size, text_length)
             
             # Find a proper sentence boundary for the end
-            if end < len(text):
-                end = self._find_sentence_boundary(text, end, 'backward')
+            if end < text_length:
+                end = find_boundary(text, end, 'backward')
             
             # Create the chunk
             chunk = {
@@ -64,14 +68,15 @@ class TextSplitter:
             chunks.append(chunk)
             
             # Calculate the next start position
-            start = max(end - self.chunk_overlap, end)
+            previous_start = start
+            start = max(end - chunk_overlap, end)
             
             # If we're overlapping, find a proper sentence boundary
             if start < end:
-                start = self._find_sentence_boundary(text, start, 'forward')
+                start = find_boundary(text, start, 'forward')
             
             # Break if we can't make progress
-            if start >= len(text) or start <= chunks[-1]['start_pos']:
+            if start >= text_length or start <= previous_start:
                 break
         
         return chunks
@@ -1,22 +1,41 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 import json
-from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor
+from openai import OpenAI, APIError
 from pathlib import Path
+from .splitter import TextSplitter
 from ..flow.model_config import ModelConfig
+from ..flow.config_loader import load_prompt_file
 
 class StoryAnalyzer:
-    def __init__(self, story_path: Path, client: OpenAI | None = None):
+    def __init__(self, story_path: Path, client: OpenAI | None = None, shard_size: int = 8000, max_workers: int = 8):
         """
         Initialize the story analyzer.
         
         Args:
             story_path: Path to the story directory
             client: OpenAI client instance, if None a new one will be created
+            shard_size: Maximum number of characters analyzed per LLM call
+            max_workers: Maximum number of concurrent LLM calls
         """
         self.story_path = story_path
         self.shared_prompt_path = Path("config/shared/prompt.yaml")
         self.client = client if client is not None else OpenAI()
         self.model_config = ModelConfig()
+        self.splitter = TextSplitter(chunk_size=shard_size, chunk_overlap=0)
+        self.max_workers = max_workers
+        
+    @property
+    def _analysis_prompt(self) -> str:
+        """The dedented story analysis prompt template, reflecting edits to prompt.yaml."""
+        # Load the story analysis prompt from shared config
+        if not self.shared_prompt_path.exists():
+            raise FileNotFoundError(f"Shared prompt file not found at {self.shared_prompt_path}")
+            
+        analysis_prompt = load_prompt_file(self.shared_prompt_path)['story_analysis']
+        
+        # Remove indentation from the template
+        return '\n'.join(line.strip() for line in analysis_prompt.split('\n'))
         
     def extract_story_elements(self, text: str) -> Dict[str, Any]:
         """
@@ -28,20 +47,8 @@ class StoryAnalyzer:
         Returns:
             Dictionary containing extracted story elements
         """
-        # Load the story analysis prompt from shared config
-        if not self.shared_prompt_path.exists():
-            raise FileNotFoundError(f"Shared prompt file not found at {self.shared_prompt_path}")
-            
-        with open(self.shared_prompt_path, 'r', encoding='utf-8') as f:
-            import yaml
-            prompts = yaml.safe_load(f)
-            analysis_prompt = prompts['story_analysis']
-            
-        # Remove indentation from the template
-        analysis_prompt = '\n'.join(line.strip() for line in analysis_prompt.split('\n'))
-        
         # Format the prompt
-        formatted_prompt = analysis_prompt.format(text=text)
+        formatted_prompt = self._analysis_prompt.format(text=text)
         
         # Get model configuration
         model_name = self.model_config.get_model_name()
@@ -63,6 +70,36 @@ class StoryAnalyzer:
         except json.JSONDecodeError:
             return {"error": "Failed to parse story analysis"}
             
+    def extract_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Extract story elements from several texts with concurrent LLM calls.
+        
+        Args:
+            texts: The story texts to analyze
+            
+        Returns:
+            List of extracted story elements, in the same order as texts; a
+            failed call yields {"error": ...} in its place
+        """
+        if len(texts) <= 1:
+            return [self._extract_or_error(text) for text in texts]
+            
+        # The calls are network-bound, so threads overlap their latency
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(texts))) as executor:
+            return list(executor.map(self._extract_or_error, texts))
+            
+    def _extract_or_error(self, text: str) -> Dict[str, Any]:
+        """
+        Extract story elements, turning a failed call into an error result.
+        
+        One shard's API error or empty response must not discard the results
+        of the others, so it is reported like an unparseable response.
+        """
+        try:
+            return self.extract_story_elements(text)
+        except (APIError, ConnectionError, TypeError, json.JSONDecodeError) as e:
+            return {"error": f"Story analysis call failed: {e}"}
+            
     def save_story_elements(self, elements: Dict[str, Any]):
         """
         Save extracted story elements to a file.
@@ -96,15 +133,39 @@ class StoryAnalyzer:
         except FileNotFoundError:
             existing_elements = {}
             
-        # Extract elements from new text
-        new_elements = self.extract_story_elements(new_text)
-        
-        # Merge elements
-        merged_elements = self._merge_elements(existing_elements, new_elements)
+        # Extract elements from each shard of the new text concurrently
+        shards = [chunk['text'] for chunk in self.splitter.split_text(new_text)]
+        if not shards:
+            return
+        results = self.extract_batch(shards)
+        
+        # Retry failed shards once, then skip the ones that still fail
+        failed = [i for i, elements in enumerate(results) if not self._is_complete(elements)]
+        for i, elements in zip(failed, self.extract_batch([shards[i] for i in failed])):
+            results[i] = elements
+        analyzed = [(shard, elements) for shard, elements in zip(shards, results) if self._is_complete(elements)]
+        if not analyzed:
+            raise ValueError(f"Story analysis failed: {results[0]}")
+        if len(analyzed) < len(shards):
+            print(f"Warning: Skipped {len(shards) - len(analyzed)} of {len(shards)} story shards that failed analysis")
+            
+        # Merge elements shard by shard, in story order
+        merged_elements = existing_elements
+        for _, new_elements in analyzed:
+            merged_elements = self._merge_elements(merged_elements, new_elements)
+            
+        # Style describes the whole text, so take it from the largest shard
+        # rather than whichever came last, which may be a short tail
+        merged_elements['style'] = max(analyzed, key=lambda pair: len(pair[0]))[1]['style']
         
         # Save updated elements
         self.save_story_elements(merged_elements)
         
+    @staticmethod
+    def _is_complete(elements: Dict[str, Any]) -> bool:
+        """Whether an analysis result has every field _merge_elements needs."""
+        return all(key in elements for key in ('style', 'characters', 'world', 'themes'))
+        
     def _merge_elements(self, existing: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
         """
         Merge existing and new story elements.
@@ -8,17 +8,18 @@ from .story_analyzer import StoryAnalyzer
 from openai import OpenAI
 
 class StorySetup:
-    def __init__(self, story_path: Path, openai_client: OpenAI | None = None):
+    def __init__(self, story_path: Path, openai_client: OpenAI | None = None, embedder: TextEmbedder | None = None):
         """
         Initialize the story setup process.
         
         Args:
             story_path: Path to the story directory
             openai_client: OpenAI client instance to use, if None a new one will be created
+            embedder: TextEmbedder instance to use, if None a new one will be created
         """
         self.story_path = story_path
         self.splitter = TextSplitter()
-        self.embedder = TextEmbedder()
+        self.embedder = embedder if embedder is not None else TextEmbedder()
         self.index_builder = IndexBuilder()
         self.version_manager = VersionManager(story_path)
         self.analyzer = StoryAnalyzer(story_path, client=openai_client)
@@ -54,6 +55,71 @@ class StorySetup:
         
         return version_id
         
+    def update_story(self, text: str, description: str = "Incremental update") -> str:
+        """
+        Re-ingest a revised story, embedding only chunks whose text is new.
+        
+        The revised text is split from scratch, so passages and positions
+        always describe it alone. Chunks whose text is already in the current
+        version reuse their saved embeddings; only new chunks are analyzed and
+        embedded. When the old chunks are an unchanged prefix of the new ones
+        (text was only appended), the new chunks are appended to the saved
+        index. Otherwise the index is rebuilt, since edited or removed
+        chunks cannot be dropped from it.
+        
+        Args:
+            text: The full revised story text
+            description: Description of this version
+            
+        Returns:
+            Version ID of the created index
+        """
+        current_version = self.version_manager.get_current_version()
+        if current_version is None:
+            return self.process_story(text, description)
+            
+        # A registered version may have no saved artifacts to reuse
+        version_dir = self.story_path / "versions" / current_version
+        passages_path = version_dir / "passages.json"
+        if not passages_path.exists():
+            return self.process_story(text, description)
+            
+        existing_chunks = self.embedder.load_embeddings(passages_path)
+        known_embeddings = {chunk['text']: chunk['embedding'] for chunk in existing_chunks}
+        
+        chunks = self.splitter.split_text(text)
+        for chunk in chunks:
+            if chunk['text'] in known_embeddings:
+                chunk['embedding'] = known_embeddings[chunk['text']]
+        new_chunks = [chunk for chunk in chunks if 'embedding' not in chunk]
+        
+        if new_chunks:
+            # Existing elements are merged with, so only new text needs analysis
+            self.analyzer.update_story_elements("\n".join(chunk['text'] for chunk in new_chunks))
+            self.embedder.embed_chunks(new_chunks)
+            
+        if self._is_prefix(existing_chunks, chunks):
+            self.index_builder.load_index(version_dir / "faiss_index" / "index.faiss")
+            self.index_builder.update_index(chunks[len(existing_chunks):])
+        else:
+            self.index_builder.reset_index()
+            self.index_builder.build_index(chunks)
+            
+        version_id = self.version_manager.create_version(description)
+        self._save_artifacts(chunks, version_id)
+        
+        return version_id
+        
+    @staticmethod
+    def _is_prefix(old_chunks: List[Dict[str, Any]], new_chunks: List[Dict[str, Any]]) -> bool:
+        """Whether old_chunks start new_chunks with the same text and positions."""
+        if len(old_chunks) > len(new_chunks):
+            return False
+        return all(
+            (old['text'], old['start_pos'], old['end_pos']) == (new['text'], new['start_pos'], new['end_pos'])
+            for old, new in zip(old_chunks, new_chunks)
+        )
+        
     def _save_artifacts(self, chunks: List[Dict[str, Any]], version_id: str):
         """
         Save all artifacts to the story directory.
@@ -75,12 +141,6 @@ class StorySetup:
             version_dir / "faiss_index" / "index.faiss"
         )
         
-        # Save metadata
-        self.index_builder.save_metadata(
-            chunks,
-            version_dir / "faiss_index" / "metadata.json"
-        )
-        
     def load_story(self, version_id: str | None = None) -> Dict[str, Any]:
         """
         Load a version of the story.
@@ -96,15 +156,17 @@ class StorySetup:
             
         version_dir = self.story_path / "versions" / version_id
         
+        chunks = self.embedder.load_embeddings(version_dir / "passages.json")
+        
         return {
-            "chunks": self.embedder.load_embeddings(
-                version_dir / "passages.json"
-            ),
+            "chunks": chunks,
             "index": self.index_builder.load_index(
                 version_dir / "faiss_index" / "index.faiss"
             ),
-            "metadata": self.index_builder.load_metadata(
-                version_dir / "faiss_index" / "metadata.json"
-            ),
+            # passages.json already holds the text and positions of every chunk
+            "metadata": [
+                {key: chunk[key] for key in ('text', 'start_pos', 'end_pos')}
+                for chunk in chunks
+            ],
             "elements": self.analyzer.load_story_elements()
         } 
\ No newline at end of file
@@ -1,9 +1,72 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, Optional
 from pathlib import Path
+from contextlib import contextmanager
 import json
+import os
 import shutil
+import threading
 from datetime import datetime
 
+def _link_or_copy(src: str, dst: Path):
+    """
+    Hardlink src to dst, falling back to a copy across filesystems.
+    
+    The copy uses os.copy_file_range where available so the kernel moves the
+    data (or reflinks it) without passing it through user space.
+    """
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+        
+    if hasattr(os, "copy_file_range"):
+        try:
+            _copy_file_range(src, dst)
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            dst.unlink(missing_ok=True)
+            
+    shutil.copy2(src, dst)
+
+@contextmanager
+def replace_version_file(path: Path) -> Iterator[Path]:
+    """
+    Rewrite a file under a version directory without modifying it in place.
+    
+    Version snapshots hardlink unchanged files from the previous version
+    (see VersionManager._link_tree), so writing into an existing file would
+    change every version sharing it. Every writer of a version file must go
+    through this helper instead: it yields a temporary path next to the
+    file, and once the block finishes, moves it over the file with
+    os.replace. That swaps only this directory entry, leaving other links
+    untouched, and readers never see a partially written file.
+    
+    Args:
+        path: File to rewrite
+        
+    Yields:
+        Temporary path to write the new contents to
+    """
+    # Unique per writer, so concurrent writers never share a temporary file
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+def _copy_file_range(src: str, dst: Path):
+    """Copy src to dst in kernel space with os.copy_file_range."""
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        remaining = os.fstat(fsrc.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+
 class VersionManager:
     def __init__(self, story_path: Path):
         """
@@ -24,6 +87,7 @@ class VersionManager:
         """Initialize the version registry file."""
         registry = {
             "current_version": None,
+            "next_seq": 1,
             "versions": []
         }
         self._save_registry(registry)
@@ -34,9 +98,16 @@ class VersionManager:
             return json.load(f)
             
     def _save_registry(self, registry: Dict[str, Any]):
-        """Save the version registry."""
-        with open(self.registry_path, 'w', encoding='utf-8') as f:
+        """
+        Save the version registry atomically.
+        
+        The registry is written to a temporary file that then replaces the
+        old one, so readers never see a partially written registry.
+        """
+        tmp_path = self.registry_path.with_suffix(".json.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
             json.dump(registry, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.registry_path)
             
     def create_version(self, description: str) -> str:
         """
@@ -49,7 +120,19 @@ class VersionManager:
             Version ID
         """
         registry = self._load_registry()
-        version_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        # Sequential ids never collide, unlike second-resolution timestamps;
+        # registries from before the counter continue after their versions
+        seq = registry.get("next_seq", len(registry["versions"]) + 1)
+        # Skip directories left behind by versions that failed part-way
+        while (self.versions_path / f"{seq:08d}").exists():
+            seq += 1
+        version_id = f"{seq:08d}"
+        
+        # Reserve the id before creating its directory, so a failure below
+        # cannot make every retry pick the same id again
+        registry["next_seq"] = seq + 1
+        self._save_registry(registry)
         
         # Copy current index to new version
         version_path = self.versions_path / version_id
@@ -57,11 +140,9 @@ class VersionManager:
         
         if registry["current_version"]:
             current_path = self.versions_path / registry["current_version"]
-            for file in current_path.glob("*"):
-                if file.is_dir():
-                    shutil.copytree(file, version_path / file.name)
-                else:
-                    shutil.copy2(file, version_path / file.name)
+            # A registered version may have no directory (e.g. not checked in)
+            if current_path.is_dir():
+                self._link_tree(current_path, version_path)
                 
         # Update registry
         registry["versions"].append({
@@ -74,6 +155,26 @@ class VersionManager:
         
         return version_id
         
+    def _link_tree(self, src: Path, dst: Path):
+        """
+        Recreate a version directory tree with hardlinks instead of copies.
+        
+        Version files are never modified in place (see replace_version_file),
+        so linked snapshots stay independent.
+        
+        Args:
+            src: Directory to snapshot
+            dst: Existing directory to populate
+        """
+        with os.scandir(src) as entries:
+            for entry in entries:
+                target = dst / entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    target.mkdir()
+                    self._link_tree(Path(entry.path), target)
+                else:
+                    _link_or_copy(entry.path, target)
+        
     def revert_to_version(self, version_id: str) -> bool:
         """
         Revert to a previous version.
@@ -1,7 +1,18 @@
 from typing import List, Dict, Optional
 from datetime import datetime
+from functools import lru_cache
+import sys
 from pydantic import BaseModel, Field
 
+@lru_cache(maxsize=4096)
+def _parse_iso(timestamp: str) -> datetime:
+    """Parse an ISO timestamp; profiles saved together share timestamps."""
+    return datetime.fromisoformat(timestamp)
+
+def _intern(value):
+    """Intern strings; other values are left for validation to reject."""
+    return sys.intern(value) if type(value) is str else value
+
 class FamilyRelation(BaseModel):
     """Represents a family relationship between characters."""
     relation_type: str = Field(..., description="Type of family relationship (e.g., parent, sibling)")
@@ -34,33 +45,44 @@ class CharacterProfile(BaseModel):
             raise ValueError("Character role cannot be empty")
             
     def to_dict(self) -> dict:
-        """Convert character profile to dictionary format."""
-        return {
-            "name": self.name,
-            "aliases": self.aliases,
-            "role": self.role,
-            "occupation": self.occupation,
-            "personality_traits": self.personality_traits,
-            "goals": self.goals,
-            "fears": self.fears,
-            "lovers": self.lovers,
-            "friends": self.friends,
-            "enemies": self.enemies,
-            "family": self.family,
-            "key_events": self.key_events,
-            "style_embedding": self.style_embedding,
-            "profile_text": self.profile_text,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        }
+        """Convert character profile to a JSON-safe dictionary."""
+        # Nested family relations become dicts and datetimes ISO strings
+        return self.model_dump(mode="json")
     
     @classmethod
     def from_dict(cls, data: dict) -> 'CharacterProfile':
-        """Create character profile from dictionary data."""
-        return cls(
+        """
+        Create character profile from trusted dictionary data.
+        
+        Skips pydantic validation, so only use it for profiles that were
+        validated before they were saved, such as the ones CharacterManager
+        writes to character_profiles.json. Use from_untrusted_dict for
+        anything else, like LLM output or files that may predate validation.
+        """
+        fields = cls._fields_from_dict(data)
+        fields["family"] = [
+            FamilyRelation.model_construct(**rel) if isinstance(rel, dict) else rel
+            for rel in fields["family"]
+        ]
+        return cls.model_construct(**fields)
+    
+    @classmethod
+    def from_untrusted_dict(cls, data: dict) -> 'CharacterProfile':
+        """Create character profile from dictionary data, validating every field."""
+        return cls(**cls._fields_from_dict(data))
+    
+    @staticmethod
+    def _fields_from_dict(data: dict) -> dict:
+        """
+        Map dictionary data to CharacterProfile fields, filling defaults.
+        
+        Roles and relation types come from a small vocabulary, so they are
+        interned and profiles share one string object per distinct value.
+        """
+        return dict(
             name=data["name"],
             aliases=data.get("aliases", []),
-            role=data["role"],
+            role=_intern(data["role"]),
             occupation=data.get("occupation", ""),
             personality_traits=data.get("personality_traits", []),
             goals=data.get("goals", []),
@@ -68,10 +90,14 @@ class CharacterProfile(BaseModel):
             lovers=data.get("lovers", []),
             friends=data.get("friends", []),
             enemies=data.get("enemies", []),
-            family=data.get("family", []),
+            family=[
+                {**rel, "relation_type": _intern(rel["relation_type"])}
+                if isinstance(rel, dict) and "relation_type" in rel else rel
+                for rel in data.get("family", [])
+            ],
             key_events=data.get("key_events", []),
             style_embedding=data.get("style_embedding"),
             profile_text=data.get("profile_text"),
-            created_at=datetime.fromisoformat(data.get("created_at", datetime.now().isoformat())),
-            updated_at=datetime.fromisoformat(data.get("updated_at", datetime.now().isoformat()))
+            created_at=_parse_iso(data["created_at"]) if "created_at" in data else datetime.now(),
+            updated_at=_parse_iso(data["updated_at"]) if "updated_at" in data else datetime.now()
         ) 
\ No newline at end of file
@@ -1,25 +1,64 @@
-from dataclasses import dataclass
-from typing import Dict, Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
+from string import Formatter
 
-@dataclass
+_FORMATTER = Formatter()
+_CONVERSIONS = {"s": str, "r": repr, "a": ascii}
+
+@dataclass(slots=True)
 class PromptTemplate:
     """Represents a prompt template with variables."""
     template: str
     variables: Dict[str, str]
     metadata: Dict[str, str]
+    _parts: Optional[List[Tuple]] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
-        """Validate prompt template data."""
+        """Validate prompt template data and parse it once for format."""
         if not self.template:
             raise ValueError("Template cannot be empty")
+        self._parts = self._parse(self.template)
+        
+    @staticmethod
+    def _parse(template: str) -> Optional[List[Tuple]]:
+        """
+        Split a template into (literal, field_name, format_spec, conversion) parts.
+        
+        Returns None for templates that only str.format can render: malformed
+        ones, and ones with positional, attribute, index or nested fields.
+        """
+        try:
+            parts = list(_FORMATTER.parse(template))
+        except ValueError:
+            return None
+        for _, field_name, format_spec, conversion in parts:
+            if field_name is None:
+                continue
+            if not field_name.isidentifier() or "{" in format_spec or (conversion and conversion not in _CONVERSIONS):
+                return None
+        return parts
             
     def format(self, **kwargs) -> str:
         """Format the template with provided variables."""
-        try:
-            return self.template.format(**kwargs)
-        except KeyError as e:
-            raise ValueError(f"Missing required variable: {e}")
+        if self._parts is None:
+            try:
+                return self.template.format(**kwargs)
+            except KeyError as e:
+                raise ValueError(f"Missing required variable: {e}")
+                
+        pieces = []
+        for literal, field_name, format_spec, conversion in self._parts:
+            pieces.append(literal)
+            if field_name is None:
+                continue
+            if field_name not in kwargs:
+                raise ValueError(f"Missing required variable: {field_name!r}")
+            value = kwargs[field_name]
+            if conversion:
+                value = _CONVERSIONS[conversion](value)
+            pieces.append(format(value, format_spec))
+        return "".join(pieces)
             
     @classmethod
     def from_file(cls, file_path: Path) -> 'PromptTemplate':
@@ -1,12 +1,24 @@
-from rich.console import Console
-from rich.prompt import Prompt, Confirm
-from rich.panel import Panel
-from rich.markdown import Markdown
+from functools import cache
 from pathlib import Path
-import yaml
 import os
+import sys
 
-console = Console()
+# rich and yaml are imported on first use, so importing StoryCreator (as
+# main.py does on every run) does not pay for them
+
+@cache
+def _console():
+    from rich.console import Console
+    return Console()
+
+@cache
+def _yaml_safe():
+    """Return PyYAML's safe (Loader, Dumper), libyaml-backed when available."""
+    try:
+        from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+    except ImportError:
+        from yaml import SafeLoader, SafeDumper
+    return SafeLoader, SafeDumper
 
 class StoryCreator:
     def __init__(self):
@@ -14,6 +26,11 @@ class StoryCreator:
         self.stories_dir.mkdir(exist_ok=True)
 
     def create_new_story(self):
+        import yaml
+        from rich.prompt import Prompt, Confirm
+        from rich.panel import Panel
+        console = _console()
+        
         console.print(Panel.fit("📚 Welcome to Story Creator! Let's create a new story.", style="bold blue"))
         
         # Get story name
@@ -24,12 +41,7 @@ class StoryCreator:
         # Create story.md
         console.print("\n[bold]Let's write your story:[/bold]")
         console.print("(Press Enter twice to finish writing)")
-        story_content = []
-        while True:
-            line = input()
-            if not line and story_content and not story_content[-1]:
-                break
-            story_content.append(line)
+        story_content = self._read_block()
         
         story_file = story_dir / "story.md"
         with open(story_file, "w", encoding='utf-8') as f:
@@ -39,17 +51,12 @@ class StoryCreator:
         console.print("\n[bold]Now, let's outline the key beats of your story:[/bold]")
         console.print("(Enter each beat on a new line. Press Enter twice to finish)")
         
-        beats = []
-        while True:
-            beat = input()
-            if not beat and beats and not beats[-1]:
-                break
-            beats.append(beat)
+        beats = self._read_block()
 
         beats_data = {"beats": [b for b in beats if b]}
         beats_file = story_dir / "beats.yaml"
         with open(beats_file, "w", encoding='utf-8') as f:
-            yaml.dump(beats_data, f, 
+            yaml.dump(beats_data, f, Dumper=_yaml_safe()[1],
                      default_flow_style=False,
                      allow_unicode=True,  # This ensures Chinese characters are written directly
                      encoding='utf-8')    # This ensures proper UTF-8 encoding
@@ -66,7 +73,26 @@ class StoryCreator:
         if Confirm.ask("\nWould you like to review your story?"):
             self.review_story(story_dir)
 
+    def _read_block(self):
+        # Buffered readline instead of input(): pasted text is read in large
+        # chunks, and EOF (Ctrl-D) ends the block instead of raising
+        lines = []
+        readline = sys.stdin.readline
+        while True:
+            line = readline()
+            if not line:
+                break
+            line = line.rstrip("\n")
+            if not line and lines and not lines[-1]:
+                break
+            lines.append(line)
+        return lines
+
     def review_story(self, story_dir):
+        import yaml
+        from rich.markdown import Markdown
+        console = _console()
+        
         console.print("\n[bold]Your Story Content:[/bold]")
         with open(story_dir / "story.md", "r", encoding='utf-8') as f:
             story_content = f.read()
@@ -74,7 +100,7 @@ class StoryCreator:
 
         console.print("\n[bold]Story Beats:[/bold]")
         with open(story_dir / "beats.yaml", "r", encoding='utf-8') as f:
-            beats_data = yaml.safe_load(f)
+            beats_data = yaml.load(f, Loader=_yaml_safe()[0])
             for i, beat in enumerate(beats_data["beats"], 1):
                 console.print(f"{i}. {beat}")
 
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import pytest
+import yaml
+
+from src.py_libs.flow.config_loader import ConfigLoader
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+BEATS_FILES = {
+    "list": "beats:\n- First beat\n- 'Second: beat'\n",
+    "other_keys_first": "title: Test\nnested:\n  beats: [wrong]\n  other: {a: 1}\nbeats:\n- Only beat\n",
+    "empty_list": "beats: []\n",
+    "scalar": "beats: x\n",
+    "null": "beats:\n",
+    "mapping": "beats:\n  first: beat\n",
+    "non_string_beat": "beats:\n- First beat\n- 12\n",
+    "missing_key": "title: Test\n",
+    "top_level_list": "- beats: [First beat]\n",
+    "empty_file": "",
+    "alias_item": "beats:\n- &a foo\n- *a\n",
+    "alias_from_other_key": "title: &t Shared beat\nbeats:\n- *t\n",
+    "alias_list": "draft: &d [First beat, Second beat]\nbeats: *d\n",
+    "alias_to_mapping": "meta: &m {a: 1}\nbeats:\n- *m\n",
+    "undefined_alias": "beats:\n- *missing\n",
+    "explicit_int_tag": "beats:\n- First beat\n- !!int '12'\n",
+    "explicit_str_tag": "beats:\n- !!str 12\n- !!str null\n",
+    "non_specific_tag": "beats:\n- ! 13\n",
+    "unknown_tag": "beats:\n- !custom First beat\n",
+    "duplicate_key": "beats:\n- First list\nbeats:\n- Second list\n",
+    "duplicate_key_scalar_first": "beats: x\nbeats:\n- Only list\n",
+    "duplicate_key_list_first": "beats:\n- Only list\nbeats: x\n",
+    "multi_document": "beats:\n- First beat\n---\nbeats:\n- Second beat\n",
+}
+
+
+@pytest.fixture
+def make_loader(tmp_path, monkeypatch):
+    # ConfigLoader resolves config/shared relative to the working directory
+    monkeypatch.chdir(REPO_ROOT)
+
+    def make(content):
+        (tmp_path / "beats.yaml").write_text(content, encoding="utf-8")
+        return ConfigLoader(tmp_path, openai_client=object())
+
+    return make
+
+
+def _outcome(load):
+    """The loaded beats, or the kind of error raised; ValidationError is a ValueError."""
+    try:
+        return load()
+    except yaml.YAMLError as e:
+        return type(e)
+    except (TypeError, KeyError, ValueError) as e:
+        return next(error_type for error_type in (TypeError, KeyError, ValueError) if isinstance(e, error_type))
+
+
+@pytest.mark.parametrize("name", sorted(BEATS_FILES))
+def test_load_beats_iter_matches_load_beats(make_loader, name):
+    loader = make_loader(BEATS_FILES[name])
+    assert _outcome(lambda: list(loader.load_beats_iter())) == _outcome(loader.load_beats)
+
+
+@pytest.mark.parametrize("story", ["Lucent", "the_clockwork_garden"])
+def test_load_beats_iter_matches_load_beats_on_sample_stories(story, monkeypatch):
+    monkeypatch.chdir(REPO_ROOT)
+    loader = ConfigLoader(REPO_ROOT / "stories" / story, openai_client=object())
+    assert list(loader.load_beats_iter()) == loader.load_beats()
+
+
+def test_load_beats_iter_raises_missing_file_at_call(tmp_path, monkeypatch):
+    monkeypatch.chdir(REPO_ROOT)
+    loader = ConfigLoader(tmp_path, openai_client=object())
+    with pytest.raises(FileNotFoundError):
+        loader.load_beats_iter()
+    with pytest.raises(FileNotFoundError):
+        loader.load_beats()
@@ -0,0 +1,73 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from src.py_libs.ingestion.story_analyzer import StoryAnalyzer
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+SHARDS = ["First shard of the story.", "Second shard FAILS here.", "Third and last shard."]
+
+
+class _ShardClient:
+    """Chat client stub that answers per shard and raises for failing shards."""
+
+    def __init__(self, failures):
+        # Number of times each marker's shard raises before it succeeds
+        self.failures = dict(failures)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        for marker, remaining in self.failures.items():
+            if marker in prompt and remaining:
+                self.failures[marker] -= 1
+                raise ConnectionError(f"shard {marker} failed")
+        shard = next(shard for shard in SHARDS if shard in prompt)
+        elements = {
+            "style": shard,
+            "characters": {shard.split()[0]: {"role": "narrator"}},
+            "world": {},
+            "themes": [shard.split()[0]],
+        }
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(elements)))])
+
+
+@pytest.fixture
+def make_analyzer(tmp_path, monkeypatch):
+    # StoryAnalyzer resolves config/shared relative to the working directory
+    monkeypatch.chdir(REPO_ROOT)
+
+    def make(client):
+        return StoryAnalyzer(tmp_path, client=client, shard_size=len(SHARDS[1]) + 1)
+
+    return make
+
+
+def test_update_story_elements_skips_shard_that_keeps_raising(make_analyzer, tmp_path):
+    analyzer = make_analyzer(_ShardClient({"FAILS": 2}))
+
+    analyzer.update_story_elements(" ".join(SHARDS))
+
+    elements = json.loads((tmp_path / "story_elements.json").read_text(encoding="utf-8"))
+    assert sorted(elements["characters"]) == ["First", "Third"]
+    assert sorted(elements["themes"]) == ["First", "Third"]
+
+
+def test_update_story_elements_retries_shard_that_raised_once(make_analyzer, tmp_path):
+    analyzer = make_analyzer(_ShardClient({"FAILS": 1}))
+
+    analyzer.update_story_elements(" ".join(SHARDS))
+
+    elements = json.loads((tmp_path / "story_elements.json").read_text(encoding="utf-8"))
+    assert sorted(elements["characters"]) == ["First", "Second", "Third"]
+
+
+def test_update_story_elements_raises_when_every_shard_fails(make_analyzer, tmp_path):
+    analyzer = make_analyzer(_ShardClient({"shard": 6}))
+
+    with pytest.raises(ValueError):
+        analyzer.update_story_elements(" ".join(SHARDS))
+    assert not (tmp_path / "story_elements.json").exists()
@@ -0,0 +1,86 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.py_libs.ingestion.version_manager import VersionManager, replace_version_file
+
+STORIES_PATH = Path(__file__).resolve().parents[2] / "stories"
+
+
+def test_create_version_without_current_version_dir(tmp_path):
+    """A registered current version with no directory snapshots nothing."""
+    story_path = tmp_path / "Lucent"
+    shutil.copytree(STORIES_PATH / "Lucent", story_path)
+    registry = json.loads((story_path / "index_registry.json").read_text(encoding="utf-8"))
+    assert not (story_path / "versions" / registry["current_version"]).exists()
+
+    manager = VersionManager(story_path)
+    version_id = manager.create_version("Initial version")
+
+    assert manager.get_current_version() == version_id
+    assert list((story_path / "versions" / version_id).iterdir()) == []
+
+
+def test_create_version_links_current_version_files(tmp_path):
+    manager = VersionManager(tmp_path)
+    first = manager.create_version("First")
+    (tmp_path / "versions" / first / "faiss_index").mkdir()
+    (tmp_path / "versions" / first / "faiss_index" / "index.faiss").write_bytes(b"index")
+    (tmp_path / "versions" / first / "passages.json").write_text("[]", encoding="utf-8")
+
+    second = manager.create_version("Second")
+
+    second_path = tmp_path / "versions" / second
+    assert (second_path / "faiss_index" / "index.faiss").read_bytes() == b"index"
+    assert (second_path / "passages.json").read_text(encoding="utf-8") == "[]"
+
+
+def test_create_version_skips_leftover_version_dirs(tmp_path, monkeypatch):
+    manager = VersionManager(tmp_path)
+
+    def fail(src, dst):
+        raise OSError("snapshot failed")
+
+    first = manager.create_version("First")
+    monkeypatch.setattr(manager, "_link_tree", fail)
+    for _ in range(2):
+        with pytest.raises(OSError):
+            manager.create_version("Fails after mkdir")
+    monkeypatch.undo()
+
+    (tmp_path / "versions" / "00000004").mkdir()
+    version_id = manager.create_version("Retry")
+
+    assert version_id == "00000005"
+    assert [v["id"] for v in manager.list_versions()] == [first, version_id]
+
+
+
+def test_replace_version_file_leaves_linked_snapshot_untouched(tmp_path):
+    manager = VersionManager(tmp_path)
+    first = manager.create_version("First")
+    (tmp_path / "versions" / first / "passages.json").write_text("old", encoding="utf-8")
+    second = manager.create_version("Second")
+    second_file = tmp_path / "versions" / second / "passages.json"
+
+    with replace_version_file(second_file) as tmp_file:
+        tmp_file.write_text("new", encoding="utf-8")
+
+    assert second_file.read_text(encoding="utf-8") == "new"
+    assert (tmp_path / "versions" / first / "passages.json").read_text(encoding="utf-8") == "old"
+    assert sorted(path.name for path in second_file.parent.iterdir()) == ["passages.json"]
+
+
+def test_replace_version_file_keeps_old_contents_on_failure(tmp_path):
+    path = tmp_path / "index.faiss"
+    path.write_bytes(b"old")
+
+    with pytest.raises(RuntimeError):
+        with replace_version_file(path) as tmp_file:
+            tmp_file.write_bytes(b"partial")
+            raise RuntimeError("write failed")
+
+    assert path.read_bytes() == b"old"
+    assert [p.name for p in tmp_path.iterdir()] == ["index.faiss"]